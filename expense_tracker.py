@@ -1,110 +1,361 @@
 # expense_tracker.py - Personal Expense Tracker with Analysis
 import sqlite3
-import pandas as pd
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+
+# pandas costs a few hundred ms to import, which dominates startup for quick
+# add/delete invocations that never build a DataFrame - import it on first use
+pd = None
+
+
+def _require_pandas():
+    """Import pandas lazily, keeping it off the plain CLI startup path"""
+    global pd
+    if pd is None:
+        import pandas
+        pd = pandas
+    return pd
+
+# numba is optional - when present, the numeric scans below compile to
+# native loops; otherwise plain NumPy handles them
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _count_above(arr, threshold):
+        """Count how many values in arr exceed threshold"""
+        count = 0
+        for value in arr:
+            count += value > threshold
+        return count
+else:
+    def _count_above(arr, threshold):
+        """Count how many values in arr exceed threshold"""
+        return int((arr > threshold).sum())
+
+# The fixed choices offered by the UI. Shared at module level so fetches can
+# pre-register them as pandas categories
+CATEGORIES = [
+    'Food & Dining',
+    'Transportation',
+    'Shopping',
+    'Entertainment',
+    'Bills & Utilities',
+    'Healthcare',
+    'Other'
+]
+
+PAYMENT_METHODS = [
+    'Cash',
+    'Credit Card',
+    'Debit Card',
+    'Digital Wallet'
+]
 
 # ===== DATABASE SETUP =====
 
+# SQL templates as module-level constants: sqlite3 keys its prepared-statement
+# cache on the exact string object, so reusing these skips re-parsing the SQL
+_SQL_CREATE_TABLE = '''
+    CREATE TABLE IF NOT EXISTS expenses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date INTEGER NOT NULL,
+        amount REAL NOT NULL,
+        category TEXT NOT NULL,
+        description TEXT,
+        payment_method TEXT
+    )
+'''
+
+_SQL_CREATE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_exp_date ON expenses(date)",
+    "CREATE INDEX IF NOT EXISTS idx_exp_cat ON expenses(category)",
+    "CREATE INDEX IF NOT EXISTS idx_exp_pm ON expenses(payment_method)",
+]
+
+_SQL_INSERT = '''
+    INSERT INTO expenses (date, amount, category, description, payment_method)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+_SQL_GET_ALL = "SELECT * FROM expenses ORDER BY date DESC"
+
+_SQL_GET_BY_DATE_RANGE = '''
+    SELECT * FROM expenses
+    WHERE date BETWEEN ? AND ?
+    ORDER BY date DESC
+'''
+
+_SQL_GET_BY_CATEGORY = "SELECT * FROM expenses WHERE category = ? ORDER BY date DESC"
+
+_SQL_GET_RECENT = "SELECT * FROM expenses ORDER BY date DESC LIMIT ?"
+
+_SQL_GET_ONE = "SELECT * FROM expenses WHERE id = ?"
+
+_SQL_DELETE = "DELETE FROM expenses WHERE id = ?"
+
+_SQL_COUNT = "SELECT COUNT(*) FROM expenses"
+
+_SQL_SIGNATURE = "SELECT COUNT(*), MAX(id) FROM expenses"
+
+_SQL_SUMMARY_STATS = '''
+    SELECT COUNT(*), SUM(amount), AVG(amount), MAX(amount), MIN(amount)
+    FROM expenses
+'''
+
+_SQL_CATEGORY_TOTALS = '''
+    SELECT category, SUM(amount), COUNT(*), AVG(amount)
+    FROM expenses
+    GROUP BY category
+    ORDER BY 2 DESC
+'''
+
+# date holds integer days since the epoch, so scale to seconds for strftime
+_SQL_MONTHLY_TOTALS = '''
+    SELECT strftime('%Y-%m', date * 86400, 'unixepoch') AS month,
+           SUM(amount), COUNT(*), AVG(amount)
+    FROM expenses
+    GROUP BY month
+    ORDER BY month
+'''
+
+# Column order of SELECT * on the expenses table
+_COLUMNS = ['id', 'date', 'amount', 'category', 'description', 'payment_method']
+
+# Dates are stored as integer days since this epoch, so fetches decode them
+# with one vectorized pd.to_datetime call instead of parsing N strings
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _date_str_to_days(date_str):
+    """Convert a 'YYYY-MM-DD' string to integer days since the epoch"""
+    # fromisoformat skips strptime's format-string parsing; the format is
+    # fixed and known here
+    return (datetime.fromisoformat(date_str) - _EPOCH).days
+
+
+def _days_to_date_str(days):
+    """Convert integer days since the epoch back to a 'YYYY-MM-DD' string"""
+    return (_EPOCH + timedelta(days=days)).strftime('%Y-%m-%d')
+
+
+# Bound format method shared by the display paths - Series.map dispatches
+# it directly, with no per-row lambda frame or f-string re-parse
+_DOLLARS = '${:.2f}'.format
+
+
+def _format_dollars(amounts):
+    """Format an amount Series as $X.XX strings for display"""
+    return amounts.map(_DOLLARS)
+
+
+def _rows_to_df(rows):
+    """Build an expenses DataFrame from raw cursor rows
+
+    Cheaper than pd.read_sql_query, which introspects column types and
+    runs dtype inference on every call; here the dtypes are known upfront.
+    """
+    pd = _require_pandas()
+    df = pd.DataFrame.from_records(rows, columns=_COLUMNS)
+    df = df.astype({'id': 'int64', 'amount': 'float64'})
+    df['date'] = pd.to_datetime(df['date'], unit='D')
+
+    # Both columns draw from small fixed vocabularies, so store them as
+    # categoricals: integer codes instead of N string objects, and groupbys
+    # hash a handful of categories rather than every row
+    df['category'] = pd.Categorical(df['category'], categories=CATEGORIES)
+    df['payment_method'] = pd.Categorical(df['payment_method'],
+                                          categories=PAYMENT_METHODS)
+    return df
+
+
 class ExpenseDatabase:
     """Handles all database operations for expenses"""
     
     def __init__(self, db_name='expenses.db'):
         self.db_name = db_name
+        self._cached_df = None
+        self._cached_signature = None
+
+        # One connection for the lifetime of the tracker - opening a new
+        # connection per query costs a file open plus a cold page cache
+        self.conn = sqlite3.connect(db_name, check_same_thread=False,
+                                    cached_statements=256)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-64000")
+
         self._init_database()
-    
+
     def _init_database(self):
         """Create the expenses table if it doesn't exist"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS expenses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT NOT NULL,
-                amount REAL NOT NULL,
-                category TEXT NOT NULL,
-                description TEXT,
-                payment_method TEXT
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        cursor = self.conn.cursor()
+
+        # Databases created before the integer-date change store dates as
+        # TEXT; rebuild the table once so the column gets INTEGER affinity.
+        # The rebuild runs in one explicit transaction - sqlite3 would
+        # otherwise commit the ALTER/CREATE immediately, and a crash midway
+        # would strand the data in expenses_old
+        cursor.execute("SELECT type FROM pragma_table_info('expenses') WHERE name = 'date'")
+        row = cursor.fetchone()
+        if row and row[0] == 'TEXT':
+            cursor.execute("BEGIN")
+            try:
+                cursor.execute("ALTER TABLE expenses RENAME TO expenses_old")
+                cursor.execute(_SQL_CREATE_TABLE)
+                cursor.execute('''
+                    INSERT INTO expenses
+                    SELECT id,
+                           CAST(julianday(date) - julianday('1970-01-01') AS INTEGER),
+                           amount, category, description, payment_method
+                    FROM expenses_old
+                ''')
+                cursor.execute("DROP TABLE expenses_old")
+                self.conn.commit()
+            except Exception:
+                # Roll back to the untouched TEXT schema; the migration will
+                # be retried on the next startup
+                self.conn.rollback()
+                raise
+
+        cursor.execute(_SQL_CREATE_TABLE)
+
+        # Index the filter/sort columns so date-range and category lookups
+        # don't need a full table scan
+        for sql in _SQL_CREATE_INDEXES:
+            cursor.execute(sql)
+
+        self.conn.commit()
         print("✓ Database initialized")
-    
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
     def add_expense(self, date, amount, category, description, payment_method):
         """Add a new expense to the database"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO expenses (date, amount, category, description, payment_method)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (date, amount, category, description, payment_method))
-        
+        cursor = self.conn.cursor()
+
+        cursor.execute(_SQL_INSERT, (_date_str_to_days(date), amount, category,
+                                     description, payment_method))
+
         expense_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
+        self.conn.commit()
+
+        self._invalidate_cache()
         return expense_id
-    
-    def get_all_expenses(self):
-        """Retrieve all expenses as a pandas DataFrame"""
-        conn = sqlite3.connect(self.db_name)
-        
-        # Load directly into pandas
-        df = pd.read_sql_query("SELECT * FROM expenses ORDER BY date DESC", conn)
-        
-        conn.close()
-        return df
+
+    def add_expenses_bulk(self, rows):
+        """Add many expenses in one transaction
+
+        rows is an iterable of (date, amount, category, description,
+        payment_method) tuples with dates as 'YYYY-MM-DD' strings. A single
+        executemany inside one transaction costs one WAL flush for the whole
+        batch instead of one per row.
+        """
+        with self.conn:
+            self.conn.executemany(_SQL_INSERT, (
+                (_date_str_to_days(date), amount, category, description, payment_method)
+                for date, amount, category, description, payment_method in rows
+            ))
+
+        self._invalidate_cache()
+
+    def _invalidate_cache(self):
+        """Drop the cached DataFrame after a write"""
+        self._cached_df = None
+        self._cached_signature = None
+
+    def _table_signature(self):
+        """Cheap signature of the table state (row count + max id)"""
+        cursor = self.conn.cursor()
+        cursor.execute(_SQL_SIGNATURE)
+        return cursor.fetchone()
+
+    def get_all_expenses(self, raw=False):
+        """Retrieve all expenses as a pandas DataFrame
+
+        With raw=True, return the plain cursor tuples instead - display-only
+        callers can use these without pulling in pandas at all.
+        """
+        if raw:
+            return self.conn.execute(_SQL_GET_ALL).fetchall()
+
+        # Reuse the cached DataFrame if the table hasn't changed
+        signature = self._table_signature()
+        if self._cached_df is not None and signature == self._cached_signature:
+            return self._cached_df.copy()
+
+        rows = self.conn.execute(_SQL_GET_ALL).fetchall()
+        df = _rows_to_df(rows)
+
+        self._cached_df = df
+        self._cached_signature = signature
+        return df.copy()
     
     def get_expenses_by_date_range(self, start_date, end_date):
         """Get expenses within a date range"""
-        conn = sqlite3.connect(self.db_name)
-        
-        query = '''
-            SELECT * FROM expenses 
-            WHERE date BETWEEN ? AND ?
-            ORDER BY date DESC
-        '''
-        df = pd.read_sql_query(query, conn, params=(start_date, end_date))
-        
-        conn.close()
-        return df
-    
+        rows = self.conn.execute(_SQL_GET_BY_DATE_RANGE,
+                                 (_date_str_to_days(start_date),
+                                  _date_str_to_days(end_date))).fetchall()
+        return _rows_to_df(rows)
+
     def get_expenses_by_category(self, category):
         """Get all expenses in a specific category"""
-        conn = sqlite3.connect(self.db_name)
-        
-        query = "SELECT * FROM expenses WHERE category = ? ORDER BY date DESC"
-        df = pd.read_sql_query(query, conn, params=(category,))
-        
-        conn.close()
-        return df
-    
+        rows = self.conn.execute(_SQL_GET_BY_CATEGORY, (category,)).fetchall()
+        return _rows_to_df(rows)
+
+    def get_recent_expenses(self, limit=10):
+        """Get the most recent expenses as raw tuples (no DataFrame)
+
+        Display-only callers can print these directly instead of paying for
+        DataFrame construction just to render a handful of rows.
+        """
+        return self.conn.execute(_SQL_GET_RECENT, (limit,)).fetchall()
+
+    def get_expense(self, expense_id):
+        """Get a single expense as a raw tuple, or None if it doesn't exist"""
+        return self.conn.execute(_SQL_GET_ONE, (expense_id,)).fetchone()
+
     def delete_expense(self, expense_id):
         """Delete an expense by ID"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
+        cursor = self.conn.cursor()
+
+        cursor.execute(_SQL_DELETE, (expense_id,))
         deleted = cursor.rowcount > 0
-        
-        conn.commit()
-        conn.close()
-        
+
+        self.conn.commit()
+
+        self._invalidate_cache()
         return deleted
-    
+
     def get_expense_count(self):
         """Get total number of expenses"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) FROM expenses")
-        count = cursor.fetchone()[0]
-        
-        conn.close()
-        return count
+        cursor = self.conn.cursor()
+        cursor.execute(_SQL_COUNT)
+        return cursor.fetchone()[0]
+
+    def get_summary_stats(self):
+        """Get (count, total, average, max, min) of amounts in one query"""
+        cursor = self.conn.cursor()
+        cursor.execute(_SQL_SUMMARY_STATS)
+        return cursor.fetchone()
+
+    def get_category_totals(self):
+        """Get (category, total, count, average) rows, highest total first"""
+        cursor = self.conn.cursor()
+        cursor.execute(_SQL_CATEGORY_TOTALS)
+        return cursor.fetchall()
+
+    def get_monthly_totals(self):
+        """Get ('YYYY-MM', total, count, average) rows in month order"""
+        cursor = self.conn.cursor()
+        cursor.execute(_SQL_MONTHLY_TOTALS)
+        return cursor.fetchall()
 
 
 # ===== ANALYSIS LAYER =====
@@ -117,76 +368,90 @@ class ExpenseAnalyzer:
     
     def get_spending_summary(self):
         """Get overall spending summary"""
-        df = self.db.get_all_expenses()
-        
-        if df.empty:
+        # Five scalars straight from SQLite - no need to move every row
+        # through pandas just to reduce one column
+        count, total, average, largest, smallest = self.db.get_summary_stats()
+
+        if count == 0:
             return None
-        
+
         summary = {
-            'total_expenses': len(df),
-            'total_spent': df['amount'].sum(),
-            'average_expense': df['amount'].mean(),
-            'largest_expense': df['amount'].max(),
-            'smallest_expense': df['amount'].min(),
+            'total_expenses': count,
+            'total_spent': total,
+            'average_expense': average,
+            'largest_expense': largest,
+            'smallest_expense': smallest,
         }
-        
+
         return summary
-    
+
+    def category_breakdown(self):
+        """Per-category totals, counts, averages, and share of total spending
+
+        One query and one DataFrame serve both the by-category summary and
+        the percentage breakdown.
+        """
+        rows = self.db.get_category_totals()
+
+        if not rows:
+            return None
+
+        pd = _require_pandas()
+        breakdown = pd.DataFrame.from_records(
+            rows, columns=['category', 'Total', 'Count', 'Average']
+        ).set_index('category')
+        breakdown['Percentage'] = breakdown['Total'] / breakdown['Total'].sum() * 100
+
+        return breakdown.round(2)
+
     def spending_by_category(self):
         """Analyze spending by category"""
-        df = self.db.get_all_expenses()
-        
-        if df.empty:
+        breakdown = self.category_breakdown()
+
+        if breakdown is None:
             return None
-        
-        category_summary = df.groupby('category').agg({
-            'amount': ['sum', 'count', 'mean']
-        }).round(2)
-        
-        category_summary.columns = ['Total', 'Count', 'Average']
-        category_summary = category_summary.sort_values('Total', ascending=False)
-        
-        return category_summary
+
+        return breakdown[['Total', 'Count', 'Average']]
     
-    def spending_by_payment_method(self):
+    def spending_by_payment_method(self, df=None):
         """Analyze spending by payment method"""
-        df = self.db.get_all_expenses()
-        
+        if df is None:
+            df = self.db.get_all_expenses()
+
         if df.empty:
             return None
         
-        payment_summary = df.groupby('payment_method').agg({
+        payment_summary = df.groupby('payment_method', observed=True).agg({
             'amount': ['sum', 'count']
         }).round(2)
         
         payment_summary.columns = ['Total', 'Count']
-        payment_summary = payment_summary.sort_values('Total', ascending=False)
-        
+        # nlargest over a handful of rows beats a general-purpose sort
+        payment_summary = payment_summary.nlargest(len(payment_summary), 'Total')
+
         return payment_summary
     
     def monthly_spending_trend(self):
         """Analyze spending trends by month"""
-        df = self.db.get_all_expenses()
-        
-        if df.empty:
+        # SQLite buckets the months with strftime in C; pandas only has to
+        # hold one small row per month
+        rows = self.db.get_monthly_totals()
+
+        if not rows:
             return None
-        
-        # Convert date to datetime and extract month
-        df['date'] = pd.to_datetime(df['date'])
-        df['month'] = df['date'].dt.to_period('M')
-        
-        monthly = df.groupby('month').agg({
-            'amount': ['sum', 'count', 'mean']
-        }).round(2)
-        
-        monthly.columns = ['Total Spent', 'Num Expenses', 'Avg Expense']
-        
+
+        pd = _require_pandas()
+        monthly = pd.DataFrame.from_records(
+            rows, columns=['month', 'Total Spent', 'Num Expenses', 'Avg Expense']
+        ).set_index('month').round(2)
+
         return monthly
     
-    def top_expenses(self, n=5):
+    def top_expenses(self, n=5, df=None):
         """Get the top N most expensive purchases"""
-        df = self.db.get_all_expenses()
-        
+        if df is None:
+            df = self.db.get_all_expenses()
+
         if df.empty:
             return None
         
@@ -194,58 +459,55 @@ class ExpenseAnalyzer:
     
     def category_percentage(self):
         """Calculate what percentage of total spending each category represents"""
-        df = self.db.get_all_expenses()
-        
-        if df.empty:
+        breakdown = self.category_breakdown()
+
+        if breakdown is None:
             return None
-        
-        total_spending = df['amount'].sum()
-        
-        category_totals = df.groupby('category')['amount'].sum().sort_values(ascending=False)
-        category_pct = (category_totals / total_spending * 100).round(2)
-        
-        result = pd.DataFrame({
-            'Amount': category_totals,
-            'Percentage': category_pct
-        })
-        
-        return result
+
+        return breakdown[['Total', 'Percentage']].rename(columns={'Total': 'Amount'})
     
-    def find_patterns(self):
+    def find_patterns(self, df=None):
         """Identify spending patterns and insights"""
-        df = self.db.get_all_expenses()
-        
+        if df is None:
+            df = self.db.get_all_expenses()
+
         if df.empty:
             return []
-        
+
         patterns = []
-        
-        # Convert date column
-        df['date'] = pd.to_datetime(df['date'])
-        
+
+        # The date column already arrives as datetime64 from the fetch
+        dates = df['date']
+
+        # Shared intermediates: one groupby and one NumPy view of amounts
+        # serve all the patterns below instead of re-deriving them each time
+        cat_sums = df.groupby('category', observed=True)['amount'].sum()
+        amounts = df['amount'].to_numpy()
+        total_spent = amounts.sum()
+        avg_expense = amounts.mean()
+
         # Pattern 1: Most frequent category
         most_frequent_category = df['category'].value_counts().index[0]
         patterns.append(f"Most frequent expense category: {most_frequent_category}")
-        
+
         # Pattern 2: Highest spending category
-        highest_spending_cat = df.groupby('category')['amount'].sum().idxmax()
-        highest_amount = df.groupby('category')['amount'].sum().max()
+        highest_spending_cat = cat_sums.idxmax()
+        highest_amount = cat_sums.max()
         patterns.append(f"Highest spending category: {highest_spending_cat} (${highest_amount:.2f})")
-        
+
         # Pattern 3: Preferred payment method
         preferred_payment = df['payment_method'].value_counts().index[0]
         patterns.append(f"Most used payment method: {preferred_payment}")
-        
+
         # Pattern 4: Average daily spending
-        date_range = (df['date'].max() - df['date'].min()).days + 1
-        daily_avg = df['amount'].sum() / date_range
+        date_range = (dates.max() - dates.min()).days + 1
+        daily_avg = total_spent / date_range
         patterns.append(f"Average daily spending: ${daily_avg:.2f}")
-        
+
         # Pattern 5: Large purchases (above average)
-        avg_expense = df['amount'].mean()
-        large_purchases = len(df[df['amount'] > avg_expense * 2])
+        large_purchases = int(_count_above(amounts, avg_expense * 2))
         patterns.append(f"Large purchases (>2x average): {large_purchases}")
-        
+
         return patterns
 
 
@@ -254,22 +516,9 @@ class ExpenseAnalyzer:
 class ExpenseTrackerUI:
     """Command-line user interface for the expense tracker"""
     
-    CATEGORIES = [
-        'Food & Dining',
-        'Transportation',
-        'Shopping',
-        'Entertainment',
-        'Bills & Utilities',
-        'Healthcare',
-        'Other'
-    ]
-    
-    PAYMENT_METHODS = [
-        'Cash',
-        'Credit Card',
-        'Debit Card',
-        'Digital Wallet'
-    ]
+    CATEGORIES = CATEGORIES
+
+    PAYMENT_METHODS = PAYMENT_METHODS
     
     def __init__(self):
         self.db = ExpenseDatabase()
@@ -281,12 +530,13 @@ class ExpenseTrackerUI:
         print("                    EXPENSE TRACKER")
         print("=" * 70)
         
-        # Show quick stats
-        count = self.db.get_expense_count()
+        # Show quick stats - the summary already carries the count, so one
+        # aggregate query covers both lines
+        summary = self.analyzer.get_spending_summary()
+        count = summary['total_expenses'] if summary else 0
         print(f"Total expenses tracked: {count}")
-        
-        if count > 0:
-            summary = self.analyzer.get_spending_summary()
+
+        if summary:
             print(f"Total spent: ${summary['total_spent']:.2f}")
         
         print("=" * 70)
@@ -320,11 +570,12 @@ class ExpenseTrackerUI:
             date_str = input("Enter date (YYYY-MM-DD) or press Enter for today: ").strip()
             
             if not date_str:
-                return datetime.now().strftime('%Y-%m-%d')
-            
+                return date.today().isoformat()
+
             try:
-                # Validate date format
-                datetime.strptime(date_str, '%Y-%m-%d')
+                # Validate date format; fromisoformat is much faster than
+                # strptime since there's no format string to interpret
+                date.fromisoformat(date_str)
                 return date_str
             except ValueError:
                 print("❌ Invalid date format. Please use YYYY-MM-DD")
@@ -381,17 +632,20 @@ class ExpenseTrackerUI:
         print("ALL EXPENSES")
         print("=" * 70)
         
-        df = self.db.get_all_expenses()
-        
-        if df.empty:
+        rows = self.db.get_all_expenses(raw=True)
+
+        if not rows:
             print("No expenses found. Add some expenses to get started!")
             return
-        
-        # Format for display
-        df['amount'] = df['amount'].apply(lambda x: f"${x:.2f}")
-        
-        print(df.to_string(index=False))
-        print(f"\nTotal expenses: {len(df)}")
+
+        # Raw tuples formatted directly - no DataFrame needed just to print
+        print(f"{'id':>5}  {'date':<10}  {'amount':>10}  {'category':<20}  "
+              f"{'description':<25}  payment_method")
+        for row_id, days, amount, category, description, payment_method in rows:
+            print(f"{row_id:>5}  {_days_to_date_str(days)}  ${amount:>9.2f}  "
+                  f"{category:<20}  {description:<25}  {payment_method}")
+
+        print(f"\nTotal expenses: {len(rows)}")
     
     def view_by_category(self):
         """View expenses filtered by category"""
@@ -410,10 +664,12 @@ class ExpenseTrackerUI:
         print(f"\n{category} Expenses:")
         print("-" * 70)
         
-        df['amount'] = df['amount'].apply(lambda x: f"${x:.2f}")
+        # Compute the total before the amounts are formatted as strings
+        total = df['amount'].sum()
+
+        df['amount'] = _format_dollars(df['amount'])
         print(df[['date', 'amount', 'description', 'payment_method']].to_string(index=False))
-        
-        total = self.db.get_expenses_by_category(category)['amount'].sum()
+
         print(f"\nTotal in {category}: ${total:.2f}")
     
     def view_by_date_range(self):
@@ -437,10 +693,12 @@ class ExpenseTrackerUI:
         print(f"\nExpenses from {start_date} to {end_date}:")
         print("-" * 70)
         
-        df['amount'] = df['amount'].apply(lambda x: f"${x:.2f}")
+        # Compute the total before the amounts are formatted as strings
+        total = df['amount'].sum()
+
+        df['amount'] = _format_dollars(df['amount'])
         print(df[['date', 'amount', 'category', 'description']].to_string(index=False))
-        
-        total = self.db.get_expenses_by_date_range(start_date, end_date)['amount'].sum()
+
         print(f"\nTotal in date range: ${total:.2f}")
     
     def delete_expense(self):
@@ -449,37 +707,40 @@ class ExpenseTrackerUI:
         print("DELETE EXPENSE")
         print("=" * 70)
         
-        # Show recent expenses
-        df = self.db.get_all_expenses()
-        
-        if df.empty:
+        # Show recent expenses - raw rows, no DataFrame needed just to print
+        recent = self.db.get_recent_expenses(10)
+
+        if not recent:
             print("No expenses to delete!")
             return
-        
+
         print("\nRecent expenses:")
-        recent = df.head(10)
-        print(recent[['id', 'date', 'amount', 'category', 'description']].to_string(index=False))
-        
+        print(f"{'id':>5}  {'date':<10}  {'amount':>10}  {'category':<20}  description")
+        for row_id, days, amount, category, description, _ in recent:
+            print(f"{row_id:>5}  {_days_to_date_str(days)}  ${amount:>9.2f}  "
+                  f"{category:<20}  {description}")
+
         try:
             expense_id = int(input("\nEnter expense ID to delete (0 to cancel): "))
-            
+
             if expense_id == 0:
                 print("❌ Deletion cancelled")
                 return
-            
+
             # Get the expense details before deleting
-            expense = df[df['id'] == expense_id]
-            
-            if expense.empty:
+            expense = self.db.get_expense(expense_id)
+
+            if expense is None:
                 print(f"❌ No expense found with ID {expense_id}")
                 return
-            
+
             # Show what will be deleted
+            _, days, amount, category, description, _ = expense
             print("\nExpense to delete:")
-            print(f"  Date: {expense.iloc[0]['date']}")
-            print(f"  Amount: ${expense.iloc[0]['amount']:.2f}")
-            print(f"  Category: {expense.iloc[0]['category']}")
-            print(f"  Description: {expense.iloc[0]['description']}")
+            print(f"  Date: {_days_to_date_str(days)}")
+            print(f"  Amount: ${amount:.2f}")
+            print(f"  Category: {category}")
+            print(f"  Description: {description}")
             
             confirm = input("\nAre you sure? (y/n): ").lower()
             
@@ -504,7 +765,10 @@ class ExpenseTrackerUI:
         if self.db.get_expense_count() == 0:
             print("\nNo expenses to analyze yet. Add some expenses first!")
             return
-        
+
+        # Fetch once and share across all the analyzer calls below
+        df = self.db.get_all_expenses()
+
         # 1. Overall Summary
         print("\n1. OVERALL SUMMARY:")
         print("-" * 70)
@@ -515,28 +779,29 @@ class ExpenseTrackerUI:
         print(f"Largest Expense: ${summary['largest_expense']:.2f}")
         print(f"Smallest Expense: ${summary['smallest_expense']:.2f}")
         
+        # 2 & 3 come from one fused category breakdown
+        breakdown = self.analyzer.category_breakdown()
+
         # 2. Spending by Category
         print("\n2. SPENDING BY CATEGORY:")
         print("-" * 70)
-        category_summary = self.analyzer.spending_by_category()
-        print(category_summary)
-        
+        print(breakdown[['Total', 'Count', 'Average']])
+
         # 3. Category Percentages
         print("\n3. SPENDING BREAKDOWN (%):")
         print("-" * 70)
-        category_pct = self.analyzer.category_percentage()
-        print(category_pct)
+        print(breakdown[['Total', 'Percentage']].rename(columns={'Total': 'Amount'}))
         
         # 4. Payment Methods
         print("\n4. PAYMENT METHOD BREAKDOWN:")
         print("-" * 70)
-        payment_summary = self.analyzer.spending_by_payment_method()
+        payment_summary = self.analyzer.spending_by_payment_method(df)
         print(payment_summary)
         
         # 5. Top Expenses
         print("\n5. TOP 5 MOST EXPENSIVE PURCHASES:")
         print("-" * 70)
-        top = self.analyzer.top_expenses(5)
+        top = self.analyzer.top_expenses(5, df)
         print(top.to_string(index=False))
         
         # 6. Monthly Trend
@@ -551,7 +816,7 @@ class ExpenseTrackerUI:
         # 7. Spending Patterns
         print("\n7. SPENDING PATTERNS & INSIGHTS:")
         print("-" * 70)
-        patterns = self.analyzer.find_patterns()
+        patterns = self.analyzer.find_patterns(df)
         for i, pattern in enumerate(patterns, 1):
             print(f"  • {pattern}")
         
@@ -586,6 +851,7 @@ class ExpenseTrackerUI:
                 print("Thank you for using Expense Tracker!")
                 print("Your data has been saved.")
                 print("=" * 70)
+                self.db.close()
                 break
             else:
                 print("❌ Invalid option. Please select 1-7.")